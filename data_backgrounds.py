@@ -0,0 +1,65 @@
+from typing import List
+import numpy as np
+from ram_model import check_word_width
+
+class DataBackground:
+    """
+    Фон данных: значение слова для каждого адреса.
+    При alternate_rows на нечетных адресах записывается инверсия шаблона.
+    """
+
+    def __init__(self, name: str, pattern: int, data_bits: int, alternate_rows: bool = False):
+        self.name = name
+        self.data_bits = data_bits
+        self.mask = (1 << data_bits) - 1
+        self.pattern = pattern & self.mask
+        self.alternate_rows = alternate_rows
+
+    def value(self, address: int) -> int:
+        if self.alternate_rows and address % 2:
+            return self.pattern ^ self.mask
+        return self.pattern
+
+    def values(self, addresses: np.ndarray) -> np.ndarray:
+        check_word_width(self.data_bits)
+        addresses = np.asarray(addresses, dtype=np.int64)
+        result = np.full(addresses.shape, self.pattern, dtype=np.uint64)
+        if self.alternate_rows:
+            result[addresses % 2 == 1] ^= np.uint64(self.mask)
+        return result
+
+    def __repr__(self) -> str:
+        return f"DataBackground({self.name}, {self.pattern:#0{self.data_bits // 4 + 2}x})"
+
+def _pattern(data_bits: int, bit_of) -> int:
+    # bit_of(j) - значение бита с номером j, считая от младшего
+    return sum(bit_of(j) << j for j in range(data_bits))
+
+def solid(data_bits: int) -> DataBackground:
+    return DataBackground("Solid", 0, data_bits)
+
+def column_stripe(data_bits: int) -> DataBackground:
+    return DataBackground("Column stripe", _pattern(data_bits, lambda j: 1 - (j & 1)), data_bits)
+
+def checkerboard(data_bits: int) -> DataBackground:
+    return DataBackground("Checkerboard", _pattern(data_bits, lambda j: (data_bits - 1 - j) % 2 == 0),
+                          data_bits, alternate_rows=True)
+
+def word_backgrounds(data_bits: int) -> List[DataBackground]:
+    """
+    log2(w)+1 фонов для словно-организованной памяти: D0 = 00..0, D1 = 0101..,
+    D2 = 0011.., ... - любая пара битов слова различается хотя бы в одном фоне
+    """
+    backgrounds = [solid(data_bits)]
+    if data_bits > 1:
+        backgrounds.append(column_stripe(data_bits))
+    k = 2
+    while (1 << (k - 1)) < data_bits:
+        block = 1 << (k - 1)
+        backgrounds.append(DataBackground(
+            f"D{k}", _pattern(data_bits, lambda j: 1 - ((j // block) & 1)), data_bits))
+        k += 1
+    return backgrounds
+
+def standard_backgrounds(data_bits: int) -> List[DataBackground]:
+    return word_backgrounds(data_bits) + [checkerboard(data_bits)]
@@ -0,0 +1,188 @@
+from typing import Optional, Tuple
+import numpy as np
+from ram_model import as_words
+
+STATUS_OK = 0
+STATUS_CORRECTED = 1
+STATUS_DETECTED = 2
+
+class SECDEDCode:
+    """
+    Расширенный код Хэмминга (SECDED) для слова из data_bits бит.
+    Кодирование и декодирование - матричные, векторизованы по пакету слов.
+    """
+
+    def __init__(self, data_bits: int):
+        self.data_bits = data_bits
+        r = 1
+        while (1 << r) < data_bits + r + 1:
+            r += 1
+        self.hamming_bits = r
+        self.check_bits = r + 1  # + общий бит четности
+        self.code_length = data_bits + r
+
+        # Данные занимают позиции кодового слова, не являющиеся степенями двойки
+        positions = [p for p in range(1, self.code_length + 1) if p & (p - 1)]
+        self.data_positions = np.array(positions[:data_bits], dtype=np.int64)
+        self.parity_matrix = ((self.data_positions[:, None] >> np.arange(r)) & 1).astype(np.int32)
+        self.syndrome_weights = (1 << np.arange(r)).astype(np.int64)
+
+        # Таблица синдромов: индекс бита данных, -1 для ошибки в проверочном бите
+        # (нулевой синдром - ошибка в общем бите четности),
+        # -2 для синдрома вне кодового слова (некорректируемая ошибка)
+        self.syndrome_table = np.full(1 << r, -2, dtype=np.int64)
+        self.syndrome_table[0] = -1
+        for b in range(r):
+            self.syndrome_table[1 << b] = -1
+        self.syndrome_table[self.data_positions] = np.arange(data_bits)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        data = data.astype(np.int32)
+        hamming = (data @ self.parity_matrix) & 1
+        overall = (data.sum(axis=-1) + hamming.sum(axis=-1)) & 1
+        return np.concatenate([hamming, overall[..., None]], axis=-1).astype(np.uint8)
+
+    def decode(self, data: np.ndarray, check: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Возвращает исправленные данные и статус по каждому слову
+        """
+        data_i = data.astype(np.int32)
+        check_i = check.astype(np.int32)
+        r = self.hamming_bits
+        syndrome_bits = ((data_i @ self.parity_matrix) + check_i[..., :r]) & 1
+        syndrome = syndrome_bits @ self.syndrome_weights
+        overall = (data_i.sum(axis=-1) + check_i.sum(axis=-1)) & 1
+
+        corrected = data.copy()
+        status = np.full(syndrome.shape, STATUS_OK, dtype=np.uint8)
+        target = self.syndrome_table[syndrome]
+
+        single = overall == 1
+        flip = single & (target >= 0)
+        idx = np.nonzero(flip)
+        corrected[idx + (target[flip],)] ^= 1
+        status[single] = STATUS_CORRECTED
+        status[single & (target == -2)] = STATUS_DETECTED
+        status[(overall == 0) & (syndrome != 0)] = STATUS_DETECTED
+        return corrected, status
+
+class ECCReport:
+    def __init__(self):
+        self.reads = 0
+        self.clean = 0
+        self.corrected = 0
+        self.detected = 0
+        self.silent = 0
+
+    def summary(self) -> str:
+        return (f"Чтений: {self.reads}, без ошибок: {self.clean}, исправлено: {self.corrected}, "
+                f"обнаружено: {self.detected}, скрытых искажений: {self.silent}")
+
+class ECCMemory:
+    """
+    ECC-обертка над FaultModel: проверочные биты хранятся отдельно для каждого слова
+    и считаются исправными, неисправности внедряются в биты данных.
+    Чтение/запись (одиночные и пакетные) и управление неисправностями повторяют
+    интерфейс FaultModel, поэтому обертку можно передавать в алгоритмы тестирования.
+    """
+
+    def __init__(self, fault_model, code_bits: Optional[int] = None):
+        self.fault_model = fault_model
+        self.ram = fault_model.ram
+        data_bits = self.ram.data_bits
+        code_bits = code_bits or data_bits
+        if data_bits % code_bits:
+            raise ValueError(f"Ширина слова {data_bits} не делится на ширину кода {code_bits}")
+        self.code = SECDEDCode(code_bits)
+        self.segments = data_bits // code_bits
+        self.check = np.zeros((self.ram.get_memory_size(), self.segments, self.code.check_bits),
+                              dtype=np.uint8)
+        self.golden = np.zeros(self.ram.get_memory_size(), dtype=np.uint64)
+        self.report = ECCReport()
+
+    @property
+    def active_faults(self):
+        return self.fault_model.active_faults
+
+    def apply_fault(self, address: int, fault_type, bit_position: int = 0, **kwargs) -> bool:
+        return self.fault_model.apply_fault(address, fault_type, bit_position, **kwargs)
+
+    def remove_fault(self, address: int, bit_position: int = 0):
+        self.fault_model.remove_fault(address, bit_position)
+
+    def clear_all_faults(self):
+        self.fault_model.clear_all_faults()
+
+    def get_active_faults(self):
+        return self.fault_model.get_active_faults()
+
+    def is_word_local(self) -> bool:
+        return self.fault_model.is_word_local()
+
+    def clear(self):
+        self.check.fill(0)
+        self.golden.fill(0)
+    
+    def reset_counters(self):
+        self.report = ECCReport()
+
+    def _split(self, rows: np.ndarray) -> np.ndarray:
+        return rows.reshape(rows.shape[0], self.segments, self.code.data_bits)
+
+    def simulate_write(self, address: int, data: int) -> bool:
+        return bool(self.simulate_write_batch([address], [data])[0])
+
+    def simulate_read(self, address: int) -> int:
+        if not self.ram._validate_address(address):
+            return -1
+        return int(self.simulate_read_batch([address])[0])
+
+    def simulate_write_batch(self, addresses, data) -> np.ndarray:
+        addresses = np.asarray(addresses, dtype=np.int64)
+        data = np.broadcast_to(as_words(data), addresses.shape)
+        valid = self.fault_model.simulate_write_batch(addresses, data)
+        # Кодер видит данные на шине, до попадания в неисправный массив
+        addrs = addresses[valid]
+        values = data[valid]
+        if self.ram.data_bits < 64:
+            values = values & np.uint64((1 << self.ram.data_bits) - 1)
+        bits = self.ram._ints_to_binary(values, self.ram.data_bits)
+        self.check[addrs] = self.code.encode(self._split(bits))
+        self.golden[addrs] = values
+        return valid
+
+    def simulate_read_batch(self, addresses) -> np.ndarray:
+        """
+        Пакетное чтение через декодер; слова uint64, адреса вне памяти дают 0
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        raw = self.fault_model.simulate_read_batch(addresses)
+        valid = self.ram._validate_addresses(addresses)
+        addrs = addresses[valid]
+        bits = self.ram._ints_to_binary(raw[valid], self.ram.data_bits)
+        corrected, status = self.code.decode(self._split(bits), self.check[addrs])
+        values = self.ram._binary_to_ints(corrected.reshape(len(addrs), -1))
+
+        detected = (status == STATUS_DETECTED).any(axis=1)
+        corrected_any = (status == STATUS_CORRECTED).any(axis=1)
+        wrong = ~detected & (values != self.golden[addrs])
+        self.report.reads += len(addrs)
+        self.report.detected += int(np.count_nonzero(detected))
+        self.report.silent += int(np.count_nonzero(wrong))
+        self.report.corrected += int(np.count_nonzero(corrected_any & ~detected & ~wrong))
+        self.report.clean += int(np.count_nonzero(~corrected_any & ~detected & ~wrong))
+
+        # При некорректируемой ошибке наружу отдаются сырые данные
+        result = raw.copy()
+        result[valid] = np.where(detected, raw[valid], values)
+        return result
+
+    def run(self, algorithm_cls, batched: bool = True):
+        """
+        Запуск алгоритма на защищенном ECC массиве со сбросом счетчиков;
+        batched=False - последовательный прогон с трассой шагов
+        """
+        self.reset_counters()
+        algorithm = algorithm_cls(self.ram, self)
+        result = algorithm.run_batched() if batched else algorithm.run()
+        return result, self.report
@@ -12,10 +12,29 @@ class FaultType(Enum):
     ADDRESS_DECODER = "Address decoder fault"
     BRIDGING = "Bridging fault"
 
+FAULT_CODES = {fault_type: code for code, fault_type in enumerate(FaultType)}
+
+# Неисправности, влияющие только на собственное слово. Пакетные прогоны алгоритмов,
+# пакетное воспроизведение журнала, выборочные кампании и матрица обнаружения
+# обрабатывают слова независимо только для этих типов; тип, затрагивающий другие
+# ячейки, сюда не добавляется и обрабатывается последовательно.
+WORD_LOCAL_FAULTS = frozenset({
+    FaultType.STUCK_AT_0,
+    FaultType.STUCK_AT_1,
+    FaultType.TRANSITION_0_TO_1,
+    FaultType.TRANSITION_1_TO_0,
+    FaultType.COUPLING,  # агрессор и жертва - биты одного слова
+    FaultType.DATA_RETENTION,
+    FaultType.ADDRESS_DECODER,  # модель пока не связывает ячейки
+    FaultType.BRIDGING,  # мост между битами одного слова
+})
+
 class FaultModel:
     def __init__(self, ram_model):
         self.ram = ram_model
         self.active_faults = {}
+        self._fault_layers = None
+        self._fault_addresses = None
     
     def apply_fault(self, address: int, fault_type: FaultType, 
                    bit_position: int = 0, **kwargs) -> bool:
@@ -27,6 +46,7 @@ class FaultModel:
             'type': fault_type,
             'params': kwargs
         }
+        self._fault_layers = None
         self.ram.inject_fault(address, fault_type.value, bit_position)
         return True
     
@@ -64,6 +84,84 @@ class FaultModel:
         
         return True
     
+    def simulate_read_batch(self, addresses) -> np.ndarray:
+        """
+        Пакетное чтение с учетом неисправностей; слова uint64, адреса вне памяти дают 0
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        result = self.ram.read_batch(addresses)
+        layers = self._get_fault_layers()
+        if not layers:
+            return result
+        pos = np.nonzero(np.isin(addresses, self._fault_addresses, kind='table'))[0]
+        if len(pos):
+            rows = self._apply_fault_layers(self.ram.memory[addresses[pos]], addresses[pos], layers)
+            result[pos] = self.ram._binary_to_ints(rows)
+        return result
+    
+    def simulate_write_batch(self, addresses, data) -> np.ndarray:
+        addresses = np.asarray(addresses, dtype=np.int64)
+        valid = self.ram.write_batch(addresses, data)
+        layers = self._get_fault_layers()
+        if not layers:
+            return valid
+        written = addresses[valid]
+        hit = self._fault_addresses[np.isin(self._fault_addresses, written, kind='table')] \
+            if len(written) else written
+        if len(hit):
+            self.ram.memory[hit] = self._apply_fault_layers(self.ram.memory[hit], hit, layers)
+        return valid
+    
+    def _get_fault_layers(self) -> List[Dict]:
+        """
+        Неисправности, сгруппированные в слои: k-й слой содержит k-ю по порядку
+        неисправность каждого адреса, поэтому адреса внутри слоя уникальны
+        """
+        if self._fault_layers is not None:
+            return self._fault_layers
+        grouped: List[List] = []
+        depth: Dict[int, int] = {}
+        for (addr, bit_pos), fault_info in self.active_faults.items():
+            level = depth.get(addr, 0)
+            depth[addr] = level + 1
+            if level == len(grouped):
+                grouped.append([])
+            fault_type, params = fault_info['type'], fault_info['params']
+            other = params.get('coupling_bit' if fault_type == FaultType.COUPLING else 'bridge_bit', 0)
+            grouped[level].append((addr, bit_pos, FAULT_CODES[fault_type], other))
+        layers = []
+        for entries in grouped:
+            entries.sort()
+            arr = np.array(entries, dtype=np.int64).reshape(-1, 4)
+            layers.append({'address': arr[:, 0], 'bit': arr[:, 1],
+                           'type': arr[:, 2], 'other': arr[:, 3]})
+        self._fault_addresses = np.array(sorted(depth), dtype=np.int64)
+        self._fault_layers = layers
+        return layers
+    
+    def _apply_fault_layers(self, rows: np.ndarray, addresses: np.ndarray,
+                            layers: List[Dict]) -> np.ndarray:
+        rows = rows.copy()
+        width = rows.shape[1]
+        for layer in layers:
+            idx = np.searchsorted(layer['address'], addresses)
+            idx = np.minimum(idx, len(layer['address']) - 1)
+            hit = layer['address'][idx] == addresses
+            pos, fi = np.nonzero(hit)[0], idx[hit]
+            bit, other, ftype = layer['bit'][fi], layer['other'][fi], layer['type'][fi]
+            ok = bit < width
+            pos, bit, other, ftype = pos[ok], bit[ok], other[ok], ftype[ok]
+            
+            sel = ftype == FAULT_CODES[FaultType.STUCK_AT_0]
+            rows[pos[sel], bit[sel]] = 0
+            sel = ftype == FAULT_CODES[FaultType.STUCK_AT_1]
+            rows[pos[sel], bit[sel]] = 1
+            sel = (ftype == FAULT_CODES[FaultType.COUPLING]) & (other < width)
+            rows[pos[sel], other[sel]] = 1 - rows[pos[sel], other[sel]]
+            sel = (ftype == FAULT_CODES[FaultType.BRIDGING]) & (other < width)
+            rows[pos[sel], other[sel]] = rows[pos[sel], bit[sel]]
+        return rows
+    
     def _apply_fault_to_binary(self, binary: np.ndarray, fault_type: FaultType,
                               bit_pos: int, params: dict) -> np.ndarray:
         result = binary.copy()
@@ -92,11 +190,60 @@ class FaultModel:
         key = (address, bit_position)
         if key in self.active_faults:
             del self.active_faults[key]
+            self._fault_layers = None
             self.ram.remove_fault(address, bit_position)
     
     def clear_all_faults(self):
         self.active_faults.clear()
+        self._fault_layers = None
         self.ram.faults.clear()
     
     def get_active_faults(self) -> Dict:
-        return self.active_faults.copy()
\ No newline at end of file
+        return self.active_faults.copy()
+    
+    def is_word_local(self) -> bool:
+        """
+        Все внедренные неисправности влияют только на собственное слово (WORD_LOCAL_FAULTS)
+        """
+        return all(info['type'] in WORD_LOCAL_FAULTS for info in self.active_faults.values())
+    
+    def snapshot(self) -> Tuple[np.ndarray, Dict]:
+        faults = {key: {'type': info['type'], 'params': dict(info['params'])}
+                  for key, info in self.active_faults.items()}
+        return self.ram.get_memory_state(), faults
+    
+    def restore(self, snapshot: Tuple[np.ndarray, Dict]):
+        memory, faults = snapshot
+        self.ram.memory[:] = memory
+        self.clear_all_faults()
+        for (address, bit_position), info in faults.items():
+            self.apply_fault(address, info['type'], bit_position, **info['params'])
+
+class FaultSpec:
+    """
+    Описание одной неисправности (тип, адрес, бит, параметры)
+    """
+
+    def __init__(self, fault_type: FaultType, address: int,
+                 bit_position: int = 0, **params):
+        self.fault_type = fault_type
+        self.address = address
+        self.bit_position = bit_position
+        self.params = params
+
+    def apply(self, fault_model: FaultModel) -> bool:
+        return fault_model.apply_fault(self.address, self.fault_type,
+                                       self.bit_position, **self.params)
+
+    @property
+    def word_local(self) -> bool:
+        return self.fault_type in WORD_LOCAL_FAULTS
+
+    def key(self) -> Tuple:
+        return (self.address, self.bit_position, self.fault_type.name,
+                tuple(sorted(self.params.items())))
+
+    def __repr__(self) -> str:
+        params = ''.join(f', {k}={v}' for k, v in sorted(self.params.items()))
+        return (f"FaultSpec({self.fault_type.name}, addr={self.address}, "
+                f"bit={self.bit_position}{params})")
@@ -0,0 +1,229 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from ram_model import RAMModel, as_words
+from fault_models import FaultModel, FaultType, FaultSpec
+from op_stream import RECORD_DTYPE, OP_CODES, replay
+
+def wilson_interval(detected: int, samples: int, z: float = 1.96) -> Tuple[float, float]:
+    """
+    Доверительный интервал Уилсона для доли обнаруженных неисправностей
+    """
+    if samples == 0:
+        return 0.0, 1.0
+    p = detected / samples
+    denom = 1 + z * z / samples
+    center = (p + z * z / (2 * samples)) / denom
+    half = z * math.sqrt(p * (1 - p) / samples + z * z / (4 * samples * samples)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+class StratumStats:
+    def __init__(self, fault_type: FaultType, population: int):
+        self.fault_type = fault_type
+        self.population = population
+        self.samples = 0
+        self.detected = 0
+        self.undetected: List[FaultSpec] = []
+
+    @property
+    def estimate(self) -> float:
+        return self.detected / self.samples if self.samples else 0.0
+
+    def interval(self, z: float = 1.96) -> Tuple[float, float]:
+        return wilson_interval(self.detected, self.samples, z)
+
+    def margin(self, z: float = 1.96) -> float:
+        low, high = self.interval(z)
+        return (high - low) / 2
+
+class SamplingResult:
+    def __init__(self, algorithm_name: str, seed: Optional[int], z: float):
+        self.algorithm_name = algorithm_name
+        self.seed = seed
+        self.z = z
+        self.strata: Dict[FaultType, StratumStats] = {}
+        self.simulations = 0
+        self.converged = False
+
+    @property
+    def coverage(self) -> float:
+        total = sum(s.population for s in self.strata.values())
+        if total == 0:
+            return 0.0
+        return sum(s.population * s.estimate for s in self.strata.values()) / total
+
+    def interval(self) -> Tuple[float, float]:
+        """
+        Стратифицированный интервал Уилсона вокруг coverage (тот же метод, что у слоев
+        и правила остановки) с эффективным объемом выборки 1 / sum(w^2 / n_h)
+        """
+        total = sum(s.population for s in self.strata.values())
+        if total == 0:
+            return 0.0, 1.0
+        inverse = 0.0
+        for s in self.strata.values():
+            w = s.population / total
+            if w == 0:
+                continue
+            if s.samples == 0:
+                return 0.0, 1.0
+            inverse += w * w / s.samples
+        n = 1 / inverse
+        return wilson_interval(self.coverage * n, n, self.z)
+
+    def summary(self) -> str:
+        low, high = self.interval()
+        lines = [f"{self.algorithm_name}: покрытие {self.coverage:.3f} "
+                 f"[{low:.3f}; {high:.3f}], "
+                 f"симуляций: {self.simulations}, seed={self.seed}"]
+        for s in self.strata.values():
+            low, high = s.interval(self.z)
+            lines.append(f"  {s.fault_type.value}: {s.detected}/{s.samples} "
+                         f"= {s.estimate:.3f} [{low:.3f}; {high:.3f}]")
+        return "\n".join(lines)
+
+class SamplingCampaign:
+    """
+    Статистическая кампания: стратифицированная выборка неисправностей
+    по FaultType с адаптивной остановкой по ширине доверительного интервала.
+    model_factory оборачивает FaultModel перед симуляцией (например, ECCMemory),
+    чтобы оценивать покрытие на защищенном массиве.
+    """
+
+    def __init__(self, algorithm_cls, address_bits: int = 8, data_bits: int = 8,
+                 fault_types: Optional[List[FaultType]] = None,
+                 margin: float = 0.05, confidence_z: float = 1.96,
+                 batch_size: int = 16, min_samples: int = 30,
+                 max_samples: int = 2000, seed: Optional[int] = None,
+                 model_factory: Optional[Callable] = None):
+        self.algorithm_cls = algorithm_cls
+        self.address_bits = address_bits
+        self.data_bits = data_bits
+        self.fault_types = list(fault_types) if fault_types else list(FaultType)
+        self.margin = margin
+        self.z = confidence_z
+        self.batch_size = batch_size
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.seed = seed
+        self.model_factory = model_factory
+        self.rng = np.random.default_rng(seed)
+        self.memory_size = 2 ** address_bits
+        # Операции алгоритма над каждым выбранным адресом (в записях адрес заменен на 0)
+        self.ops_by_address: Dict[int, np.ndarray] = {}
+
+    def population(self, fault_type: FaultType) -> int:
+        cells = self.memory_size * self.data_bits
+        if fault_type in (FaultType.COUPLING, FaultType.BRIDGING):
+            return cells * max(1, self.data_bits - 1)
+        return cells
+
+    def draw(self, fault_type: FaultType, count: int) -> List[FaultSpec]:
+        addresses = self.rng.integers(0, self.memory_size, size=count)
+        bits = self.rng.integers(0, self.data_bits, size=count)
+        # Второй бит для coupling/bridging выбирается среди остальных битов слова
+        others = self.rng.integers(0, max(1, self.data_bits - 1), size=count)
+        specs = []
+        for addr, bit, other in zip(addresses.tolist(), bits.tolist(), others.tolist()):
+            params = {}
+            if self.data_bits > 1 and other >= bit:
+                other += 1
+            if fault_type == FaultType.COUPLING:
+                params['coupling_bit'] = other
+            elif fault_type == FaultType.BRIDGING:
+                params['bridge_bit'] = other
+            specs.append(FaultSpec(fault_type, addr, bit, **params))
+        return specs
+
+    def collect_ops(self, addresses):
+        """
+        Один исправный пакетный прогон алгоритма, из которого сохраняются только
+        операции над заданными адресами
+        """
+        wanted = np.unique(np.asarray(list(addresses), dtype=np.int64))
+        wanted = wanted[~np.isin(wanted, list(self.ops_by_address))]
+        if len(wanted) == 0:
+            return
+        chunks = []
+
+        def listener(op, address, data, step):
+            addrs = np.atleast_1d(np.asarray(address, dtype=np.int64))
+            keep = np.isin(addrs, wanted, kind='table')
+            if keep.any():
+                chunk = np.zeros(int(np.count_nonzero(keep)), dtype=RECORD_DTYPE)
+                chunk['op'] = OP_CODES[op]
+                chunk['address'] = addrs[keep]
+                chunk['data'] = np.broadcast_to(as_words(data), addrs.shape)[keep]
+                chunks.append(chunk)
+
+        ram = RAMModel(self.address_bits, self.data_bits)
+        algorithm = self.algorithm_cls(ram, FaultModel(ram))
+        algorithm.op_listener = listener
+        algorithm.run_batched()
+        del algorithm, ram
+
+        records = np.concatenate(chunks) if chunks else np.zeros(0, dtype=RECORD_DTYPE)
+        records = records[np.argsort(records['address'], kind='stable')]
+        bounds = np.searchsorted(records['address'], wanted, side='left')
+        ends = np.searchsorted(records['address'], wanted, side='right')
+        records['address'] = 0
+        for addr, lo, hi in zip(wanted.tolist(), bounds.tolist(), ends.tolist()):
+            self.ops_by_address[addr] = records[lo:hi]
+
+    def simulate(self, spec: FaultSpec) -> bool:
+        """
+        Неисправность из WORD_LOCAL_FAULTS влияет только на свое слово, поэтому
+        воспроизводятся лишь операции над ее адресом на модели из одного слова;
+        остальные симулируются полным последовательным прогоном
+        """
+        if not spec.word_local:
+            ram = RAMModel(self.address_bits, self.data_bits)
+            fault_model = FaultModel(ram)
+            spec.apply(fault_model)
+            model = self.model_factory(fault_model) if self.model_factory else fault_model
+            return not self.algorithm_cls(ram, model).run().passed
+        if spec.address not in self.ops_by_address:
+            self.collect_ops([spec.address])
+        ram = RAMModel(0, self.data_bits)
+        fault_model = FaultModel(ram)
+        FaultSpec(spec.fault_type, 0, spec.bit_position, **spec.params).apply(fault_model)
+        model = self.model_factory(fault_model) if self.model_factory else fault_model
+        result = replay(self.ops_by_address[spec.address], model,
+                        max_errors=0, stop_on_error=True)
+        return not result.passed
+
+    def _done(self, stats: StratumStats) -> bool:
+        if stats.samples >= self.max_samples:
+            return True
+        return stats.samples >= self.min_samples and stats.margin(self.z) <= self.margin
+
+    def run(self) -> SamplingResult:
+        result = SamplingResult(self.algorithm_cls.__name__, self.seed, self.z)
+        for ft in self.fault_types:
+            result.strata[ft] = StratumStats(ft, self.population(ft))
+
+        # Выборка тянется заранее (до max_samples на слой), чтобы операции по всем
+        # выбранным адресам собрать за один прогон алгоритма
+        pools = {ft: self.draw(ft, self.max_samples) for ft in self.fault_types}
+        self.collect_ops(spec.address for specs in pools.values() for spec in specs
+                         if spec.word_local)
+
+        active = list(self.fault_types)
+        while active:
+            for ft in active:
+                stats = result.strata[ft]
+                count = min(self.batch_size, self.max_samples - stats.samples)
+                for spec in pools[ft][stats.samples:stats.samples + count]:
+                    detected = self.simulate(spec)
+                    stats.samples += 1
+                    result.simulations += 1
+                    if detected:
+                        stats.detected += 1
+                    else:
+                        stats.undetected.append(spec)
+            active = [ft for ft in active if not self._done(result.strata[ft])]
+
+        result.converged = all(
+            s.margin(self.z) <= self.margin for s in result.strata.values()
+        )
+        return result
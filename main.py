@@ -14,6 +14,7 @@ from fault_models import FaultModel, FaultType
 from testing_algorithms import (MarchC, MarchB, Checkerboard, WalkingOne, 
                                 GallopingPattern, TestingAlgorithm)
 from verification import Verifier, DynamicVerifier
+from result_cache import ResultCache
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -21,6 +22,7 @@ class MainWindow(QMainWindow):
         self.ram = RAMModel(address_bits=8, data_bits=8)
         self.fault_model = FaultModel(self.ram)
         self.current_test_result = None
+        self.result_cache = ResultCache()
         self.init_ui()
         self.run_verification()
     
@@ -216,9 +218,8 @@ class MainWindow(QMainWindow):
         self.tabs.setCurrentIndex(0)
         QApplication.processEvents()
 
-        algo = algos[algo_name](self.ram, self.fault_model)
         try:
-            res = algo.run()
+            res = self.result_cache.run(algos[algo_name], self.ram, self.fault_model)
             self.display_results(res)
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", str(e))
@@ -258,6 +259,12 @@ class MainWindow(QMainWindow):
         r3 = Verifier.validate_digital_twin(self.ram, self.fault_model)
         log += f"Integration: {'OK' if r3.passed else 'FAIL'}\n"
 
+        r4 = Verifier.verify_ecc_code(self.ram.data_bits)
+        log += f"ECC SECDED: {'OK' if r4.passed else 'FAIL'}\n"
+
+        r5 = Verifier.verify_result_cache()
+        log += f"Result Cache: {'OK' if r5.passed else 'FAIL'}\n"
+
         self.verification_text.setText(log)
 
     def run_dynamic_tests(self):
@@ -276,6 +283,18 @@ class MainWindow(QMainWindow):
         d3 = DynamicVerifier.run_pattern_stress(self.ram)
         log += f"Pattern Stress: {'OK' if d3.passed else 'FAIL'}\n"
 
+        d4 = DynamicVerifier.run_batched_equivalence(self.ram)
+        log += f"Batched vs Sequential: {'OK' if d4.passed else 'FAIL'} ({d4.execution_time:.3f}s)\n"
+
+        d5 = DynamicVerifier.run_replay_equivalence(self.ram)
+        log += f"Record/Replay: {'OK' if d5.passed else 'FAIL'} ({d5.execution_time:.3f}s)\n"
+
+        d6 = DynamicVerifier.run_detection_matrix_check(self.ram)
+        log += f"Detection Matrix: {'OK' if d6.passed else 'FAIL'} ({d6.execution_time:.3f}s)\n"
+
+        d7 = DynamicVerifier.run_server_round_trip()
+        log += f"RAM Server: {'OK' if d7.passed else 'FAIL'} ({d7.execution_time:.3f}s)\n"
+
         self.verification_text.setText(log)
         self.progress_bar.setVisible(False)
 
@@ -0,0 +1,245 @@
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Union
+import numpy as np
+from ram_model import as_words
+from testing_algorithms import TestResult
+
+OP_READ = 0
+OP_WRITE = 1
+OP_CODES = {"READ": OP_READ, "WRITE": OP_WRITE}
+
+# 16 байт на операцию: код, номер элемента теста, адрес, данные (для чтения - ожидаемое значение)
+RECORD_DTYPE = np.dtype([
+    ('op', np.uint8),
+    ('element', np.uint16),
+    ('address', np.uint32),
+    ('data', np.uint64),
+], align=True)
+
+MAGIC = b'KOPL'
+FOOTER_MAGIC = b'KEND'
+VERSION = 1
+HEADER = struct.Struct('<4sHHH6x')
+FOOTER = struct.Struct('<I4s')
+
+class OpLogWriter:
+    """
+    Запись потока операций в бинарный файл блоками по chunk_size записей
+    """
+
+    def __init__(self, path: str, address_bits: int, data_bits: int,
+                 chunk_size: int = 65536):
+        self.path = path
+        self.address_bits = address_bits
+        self.data_bits = data_bits
+        self.elements: Dict[str, int] = {}
+        self.buffer = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self.pending = 0
+        self.count = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, address_bits, data_bits))
+
+    def element_id(self, name: str) -> int:
+        if name not in self.elements:
+            if len(self.elements) > np.iinfo(np.uint16).max:
+                raise ValueError("Слишком много элементов теста для формата журнала")
+            self.elements[name] = len(self.elements)
+        return self.elements[name]
+
+    def append(self, op: str, address: int, data: int, element: str):
+        if self.pending == len(self.buffer):
+            self.flush()
+        rec = self.buffer[self.pending]
+        rec['op'] = OP_CODES[op]
+        rec['element'] = self.element_id(element)
+        rec['address'] = address
+        rec['data'] = data & 0xFFFFFFFFFFFFFFFF
+        self.pending += 1
+
+    def append_batch(self, op: str, addresses, data, element: str):
+        addresses = np.asarray(addresses)
+        records = np.zeros(len(addresses), dtype=RECORD_DTYPE)
+        records['op'] = OP_CODES[op]
+        records['element'] = self.element_id(element)
+        records['address'] = addresses
+        records['data'] = np.broadcast_to(as_words(data), addresses.shape)
+        self.flush()
+        self.file.write(records.tobytes())
+        self.count += len(records)
+
+    def flush(self):
+        if self.pending:
+            self.file.write(self.buffer[:self.pending].tobytes())
+            self.count += self.pending
+            self.pending = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        names = [None] * len(self.elements)
+        for name, idx in self.elements.items():
+            names[idx] = name
+        blob = json.dumps(names, ensure_ascii=False).encode()
+        self.file.write(blob)
+        self.file.write(FOOTER.pack(len(blob), FOOTER_MAGIC))
+        self.file.close()
+
+    def __call__(self, op: str, address, data, step: str):
+        if np.ndim(address):
+            self.append_batch(op, address, data, step)
+        else:
+            self.append(op, address, data, step)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class OpLog:
+    """
+    Журнал операций, отображенный в память через numpy.memmap без копирования
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            magic, version, self.address_bits, self.data_bits = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Неверный формат журнала операций: {path}")
+            f.seek(size - FOOTER.size)
+            names_len, end_magic = FOOTER.unpack(f.read(FOOTER.size))
+            if end_magic != FOOTER_MAGIC:
+                raise ValueError(f"Журнал операций не был закрыт: {path}")
+            f.seek(size - FOOTER.size - names_len)
+            self.element_names: List[str] = json.loads(f.read(names_len).decode())
+        count = (size - HEADER.size - FOOTER.size - names_len) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def read_count(self) -> int:
+        return int(np.count_nonzero(self.records['op'] == OP_READ))
+
+def record(algorithm, path: str, chunk_size: int = 65536, batched: bool = True) -> TestResult:
+    """
+    Запуск алгоритма с записью всех его операций в журнал.
+    По умолчанию поток пишется пакетным прогоном (порядок операций в каждой ячейке
+    тот же); batched=False - последовательный прогон, если нужна трасса шагов.
+    """
+    with OpLogWriter(path, algorithm.ram.address_bits, algorithm.ram.data_bits,
+                     chunk_size) as writer:
+        algorithm.op_listener = writer
+        try:
+            return algorithm.run_batched() if batched else algorithm.run()
+        finally:
+            algorithm.op_listener = None
+
+def _segment_bounds(ops: np.ndarray, addresses: np.ndarray) -> List[int]:
+    """
+    Границы сегментов, каждый из которых можно выполнить пакетом "все чтения, затем все записи":
+    сегмент обрывается на первом чтении адреса, уже записанного внутри этого сегмента.
+    Для каждого чтения один раз вычисляется позиция последней предшествующей записи того же
+    адреса, после чего границы находятся проходом по кандидатам без повторной сортировки.
+    """
+    n = len(ops)
+    positions = np.arange(n, dtype=np.int64)
+    is_write = ops == OP_WRITE
+    order = np.lexsort((positions, addresses))
+    sorted_addr = addresses[order]
+    group = np.r_[0, np.cumsum(sorted_addr[1:] != sorted_addr[:-1])] if n else positions
+    # Сдвиг на номер группы позволяет сделать накопленный максимум внутри каждого адреса
+    key = group * (n + 1) + np.where(is_write[order], order + 1, 0)
+    last_write = np.empty(n, dtype=np.int64)
+    last_write[order] = np.maximum.accumulate(key) - group * (n + 1) - 1 if n else key
+
+    candidates = np.nonzero(~is_write & (last_write >= 0))[0]
+    cand_write = last_write[candidates]
+    bounds, start = [], 0
+    while True:
+        i = int(np.searchsorted(candidates, start, side='right'))
+        found, block = None, 64
+        while i < len(candidates):
+            hit = np.nonzero(cand_write[i:i + block] >= start)[0]
+            if len(hit):
+                found = int(candidates[i + hit[0]])
+                break
+            i += block
+            block *= 2
+        if found is None:
+            bounds.append(n)
+            return bounds
+        bounds.append(found)
+        start = found
+
+def _segments(records: np.ndarray, fault_model, window: int):
+    """
+    Выполняет журнал посегментно и для каждого сегмента отдает
+    адреса чтений, ожидаемые и фактические значения и маску допустимых адресов.
+    Если неисправности затрагивают другие слова (FaultModel.is_word_local),
+    каждая операция выполняется отдельным сегментом.
+    """
+    word_local = fault_model.is_word_local()
+    for offset in range(0, len(records), window):
+        chunk = records[offset:offset + window]
+        ops = chunk['op']
+        addresses = chunk['address'].astype(np.int64)
+        data = chunk['data'].astype(np.uint64)
+        start = 0
+        bounds = _segment_bounds(ops, addresses) if word_local else range(1, len(chunk) + 1)
+        for end in bounds:
+            seg_ops, seg_addr, seg_data = ops[start:end], addresses[start:end], data[start:end]
+            start = end
+            is_read = seg_ops == OP_READ
+            if is_read.any():
+                r_addr, expected = seg_addr[is_read], seg_data[is_read]
+                valid = fault_model.ram._validate_addresses(r_addr)
+                yield r_addr, expected, fault_model.simulate_read_batch(r_addr), valid
+            if not is_read.all():
+                fault_model.simulate_write_batch(seg_addr[~is_read], seg_data[~is_read])
+
+def replay(op_log: Union[OpLog, np.ndarray], fault_model, window: int = 1 << 20,
+           max_errors: Optional[int] = None, stop_on_error: bool = False) -> TestResult:
+    """
+    Воспроизведение журнала через пакетные пути simulate_read_batch/simulate_write_batch.
+    При неисправностях из WORD_LOCAL_FAULTS слова независимы, поэтому внутри сегмента
+    без конфликтов чтения выполняются одним пакетом до записей.
+    При stop_on_error воспроизведение прекращается после первого сегмента с ошибкой.
+    Вместо журнала можно передать массив записей RECORD_DTYPE.
+    """
+    result = TestResult()
+    records = op_log.records if isinstance(op_log, OpLog) else op_log
+    for r_addr, expected, actual, valid in _segments(records, fault_model, window):
+        bad = np.nonzero((actual != expected) | ~valid)[0]
+        if len(bad) == 0:
+            continue
+        result.passed = False
+        if max_errors is None or len(result.errors) < max_errors:
+            room = len(bad) if max_errors is None else max_errors - len(result.errors)
+            for i in bad[:room].tolist():
+                # Как и simulate_read, чтение вне памяти отображается значением -1
+                got = int(actual[i]) if valid[i] else -1
+                result.errors.append(
+                    f"Адрес {r_addr[i]}: ожидалось {expected[i]}, получено {got}")
+        if stop_on_error:
+            break
+    return result
+
+def failing_addresses(op_log: Union[OpLog, np.ndarray], fault_model,
+                      window: int = 1 << 20) -> np.ndarray:
+    """
+    Адреса, на которых хотя бы одно чтение не совпало с ожидаемым значением
+    """
+    records = op_log.records if isinstance(op_log, OpLog) else op_log
+    failed = [r_addr[(actual != expected) | ~valid]
+              for r_addr, expected, actual, valid in _segments(records, fault_model, window)]
+    return np.unique(np.concatenate(failed)) if failed else np.zeros(0, dtype=np.int64)
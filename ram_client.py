@@ -0,0 +1,117 @@
+import select
+import socket
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from fault_models import FaultSpec
+from ram_protocol import (FRAME_HEADER, OP_HELLO, OP_READ, OP_WRITE, OP_INJECT,
+                          OP_CLEAR_FAULTS, OP_SNAPSHOT, OP_RESTORE, OP_RESET,
+                          OP_DROP_SNAPSHOT, STATUS_OK, ADDRESS_DTYPE, DATA_DTYPE, COUNT, GEOMETRY,
+                          frame, encode_write, encode_faults)
+
+class RAMServerError(Exception):
+    pass
+
+class RAMClient:
+    """
+    Тонкий клиент сервера двойника ОЗУ.
+    Методы send_* только ставят запрос в конвейер и возвращают его номер,
+    wait() дожидается ответа; обычные методы - send_* + wait().
+    """
+
+    def __init__(self, address: Union[str, Tuple[str, int]]):
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.connect(address)
+        self.sock.setblocking(False)
+        self.next_id = 0
+        self.inbox = bytearray()
+        self.responses: Dict[int, Tuple[int, bytes]] = {}
+        self.address_bits, self.data_bits = GEOMETRY.unpack(self.wait(self._send(OP_HELLO)))
+
+    def _send(self, code: int, payload: bytes = b'') -> int:
+        request_id = self.next_id
+        self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+        data = memoryview(frame(request_id, code, payload))
+        # Пока сервер не может принять запрос, читаем его ответы, иначе обе стороны
+        # заблокируются на заполненных буферах сокета
+        while data:
+            readable, writable, _ = select.select([self.sock], [self.sock], [])
+            if readable:
+                self._receive()
+            if writable:
+                try:
+                    sent = self.sock.send(data)
+                except BlockingIOError:
+                    continue
+                data = data[sent:]
+        return request_id
+
+    def _receive(self):
+        chunk = self.sock.recv(1 << 20)
+        if not chunk:
+            raise ConnectionError("Сервер закрыл соединение")
+        self.inbox += chunk
+        while len(self.inbox) >= FRAME_HEADER.size:
+            length, request_id, status = FRAME_HEADER.unpack_from(self.inbox)
+            end = FRAME_HEADER.size + length
+            if len(self.inbox) < end:
+                break
+            self.responses[request_id] = (status, bytes(self.inbox[FRAME_HEADER.size:end]))
+            del self.inbox[:end]
+
+    def wait(self, request_id: int) -> bytes:
+        while request_id not in self.responses:
+            select.select([self.sock], [], [])
+            try:
+                self._receive()
+            except BlockingIOError:
+                pass
+        status, payload = self.responses.pop(request_id)
+        if status != STATUS_OK:
+            raise RAMServerError(payload.decode(errors='replace'))
+        return payload
+
+    def send_read(self, addresses) -> int:
+        return self._send(OP_READ, np.asarray(addresses, dtype=ADDRESS_DTYPE).tobytes())
+
+    def send_write(self, addresses, data) -> int:
+        return self._send(OP_WRITE, encode_write(addresses, data))
+
+    def send_inject(self, specs: List[FaultSpec]) -> int:
+        return self._send(OP_INJECT, encode_faults(specs))
+
+    def read(self, addresses) -> np.ndarray:
+        return np.frombuffer(self.wait(self.send_read(addresses)), DATA_DTYPE).copy()
+
+    def write(self, addresses, data) -> int:
+        return COUNT.unpack(self.wait(self.send_write(addresses, data)))[0]
+
+    def inject(self, specs: List[FaultSpec]) -> int:
+        return COUNT.unpack(self.wait(self.send_inject(specs)))[0]
+
+    def clear_faults(self):
+        self.wait(self._send(OP_CLEAR_FAULTS))
+
+    def snapshot(self) -> int:
+        return COUNT.unpack(self.wait(self._send(OP_SNAPSHOT)))[0]
+
+    def restore(self, snapshot_id: int):
+        self.wait(self._send(OP_RESTORE, COUNT.pack(snapshot_id)))
+
+    def drop_snapshot(self, snapshot_id: int):
+        self.wait(self._send(OP_DROP_SNAPSHOT, COUNT.pack(snapshot_id)))
+
+    def reset(self):
+        self.wait(self._send(OP_RESET))
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
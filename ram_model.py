@@ -2,6 +2,24 @@ import numpy as np
 from typing import Optional, List, Tuple
 from enum import Enum
 
+# Пакетные пути хранят слово в uint64
+MAX_WORD_BITS = 64
+
+def check_word_width(bits: int):
+    if bits > MAX_WORD_BITS:
+        raise ValueError(f"Пакетные операции поддерживают слова до {MAX_WORD_BITS} бит, "
+                         f"получено {bits}")
+
+def as_words(values) -> np.ndarray:
+    """
+    Приведение значений к беззнаковым 64-битным словам (отрицательные - в дополнительном коде)
+    """
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        return np.array([int(v) & 0xFFFFFFFFFFFFFFFF for v in arr.ravel()],
+                        dtype=np.uint64).reshape(arr.shape)
+    return arr.astype(np.uint64)
+
 class RAMModel:
     """
     Цифровой двойник ОЗУ
@@ -39,6 +57,32 @@ class RAMModel:
     def reset(self):
         self.clear()
     
+    def write_batch(self, addresses, data) -> np.ndarray:
+        addresses = np.asarray(addresses, dtype=np.int64)
+        data = np.broadcast_to(as_words(data), addresses.shape)
+        valid = self._validate_addresses(addresses)
+        addrs, values = addresses[valid], data[valid]
+        # При повторных адресах в пакете остается последняя запись, как при поочередной записи;
+        # монотонный проход (обычный March-элемент) повторов не содержит
+        step = np.diff(addrs)
+        if not ((step > 0).all() or (step < 0).all()):
+            uniq, last = np.unique(addrs[::-1], return_index=True)
+            if len(uniq) < len(addrs):
+                addrs, values = uniq, values[::-1][last]
+        self.memory[addrs] = self._ints_to_binary(values, self.data_bits)
+        return valid
+    
+    def read_batch(self, addresses) -> np.ndarray:
+        """
+        Слова uint64; для адресов вне памяти возвращается 0,
+        их следует отсекать маской _validate_addresses
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        valid = self._validate_addresses(addresses)
+        result = np.zeros(addresses.shape, dtype=np.uint64)
+        result[valid] = self._binary_to_ints(self.memory[addresses[valid]])
+        return result
+    
     def get_memory_state(self) -> np.ndarray:
         return self.memory.copy()
     
@@ -48,6 +92,9 @@ class RAMModel:
     def _validate_address(self, address: int) -> bool:
         return 0 <= address < self.memory_size
     
+    def _validate_addresses(self, addresses: np.ndarray) -> np.ndarray:
+        return (addresses >= 0) & (addresses < self.memory_size)
+    
     def _int_to_binary(self, value: int, bits: int) -> np.ndarray:
         binary_str = format(value & ((1 << bits) - 1), f'0{bits}b')
         return np.array([int(bit) for bit in binary_str], dtype=np.uint8)
@@ -58,6 +105,25 @@ class RAMModel:
             result = (result << 1) | int(bit)
         return result
     
+    def _ints_to_binary(self, values: np.ndarray, bits: int) -> np.ndarray:
+        # Слова раскладываются на биты через big-endian байты и np.unpackbits;
+        # распаковываются только байты, занятые словом
+        check_word_width(bits)
+        nbytes = (bits + 7) // 8
+        words = as_words(values).reshape(-1).astype('>u8')
+        tail = words.view(np.uint8).reshape(-1, 8)[:, 8 - nbytes:]
+        return np.unpackbits(tail, axis=1)[:, nbytes * 8 - bits:]
+    
+    def _binary_to_ints(self, rows: np.ndarray) -> np.ndarray:
+        bits = rows.shape[1]
+        check_word_width(bits)
+        nbytes = (bits + 7) // 8
+        padded = np.zeros((rows.shape[0], nbytes * 8), dtype=np.uint8)
+        padded[:, nbytes * 8 - bits:] = rows
+        full = np.zeros((rows.shape[0], 8), dtype=np.uint8)
+        full[:, 8 - nbytes:] = np.packbits(padded, axis=1)
+        return full.view('>u8').ravel().astype(np.uint64)
+    
     def inject_fault(self, address: int, fault_type: str, bit_position: int = 0):
         if not self._validate_address(address):
             return
@@ -0,0 +1,69 @@
+import struct
+from typing import List
+import numpy as np
+from fault_models import FaultType, FaultSpec, FAULT_CODES
+from ram_model import as_words
+
+# Кадр: длина полезной нагрузки, номер запроса, код операции (в ответе - статус)
+FRAME_HEADER = struct.Struct('<IIB')
+MAX_FRAME = 64 * 1024 * 1024
+
+OP_HELLO = 1
+OP_READ = 2
+OP_WRITE = 3
+OP_INJECT = 4
+OP_CLEAR_FAULTS = 5
+OP_SNAPSHOT = 6
+OP_RESTORE = 7
+OP_RESET = 8
+OP_DROP_SNAPSHOT = 9
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+ADDRESS_DTYPE = np.dtype('<u4')
+DATA_DTYPE = np.dtype('<u8')
+FAULT_DTYPE = np.dtype([
+    ('address', '<u4'),
+    ('bit', '<u2'),
+    ('type', 'u1'),
+    ('other', '<u2'),
+])
+FAULT_TYPES = {code: fault_type for fault_type, code in FAULT_CODES.items()}
+COUNT = struct.Struct('<I')
+GEOMETRY = struct.Struct('<HH')
+
+def frame(request_id: int, code: int, payload: bytes = b'') -> bytes:
+    return FRAME_HEADER.pack(len(payload), request_id, code) + payload
+
+def encode_write(addresses, data) -> bytes:
+    addresses = np.asarray(addresses, dtype=ADDRESS_DTYPE)
+    data = np.broadcast_to(as_words(data).astype(DATA_DTYPE), addresses.shape)
+    return COUNT.pack(len(addresses)) + addresses.tobytes() + np.ascontiguousarray(data).tobytes()
+
+def decode_write(payload: bytes):
+    (count,) = COUNT.unpack_from(payload)
+    offset = COUNT.size
+    addresses = np.frombuffer(payload, ADDRESS_DTYPE, count, offset)
+    data = np.frombuffer(payload, DATA_DTYPE, count, offset + count * ADDRESS_DTYPE.itemsize)
+    return addresses, data
+
+def encode_faults(specs: List[FaultSpec]) -> bytes:
+    records = np.zeros(len(specs), dtype=FAULT_DTYPE)
+    for i, spec in enumerate(specs):
+        key = 'coupling_bit' if spec.fault_type == FaultType.COUPLING else 'bridge_bit'
+        records[i] = (spec.address, spec.bit_position, FAULT_CODES[spec.fault_type],
+                      spec.params.get(key, 0))
+    return records.tobytes()
+
+def decode_faults(payload: bytes) -> List[FaultSpec]:
+    specs = []
+    for address, bit, code, other in np.frombuffer(payload, FAULT_DTYPE).tolist():
+        fault_type = FAULT_TYPES[code]
+        params = {}
+        if fault_type == FaultType.COUPLING:
+            params['coupling_bit'] = other
+        elif fault_type == FaultType.BRIDGING:
+            params['bridge_bit'] = other
+        specs.append(FaultSpec(fault_type, address, bit, **params))
+    return specs
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Asyncio-сервер цифрового двойника ОЗУ (Unix-сокет или TCP на localhost)
+"""
+import argparse
+import asyncio
+import ipaddress
+import os
+import stat
+from typing import Dict, Optional
+import numpy as np
+from ram_model import RAMModel
+from fault_models import FaultModel
+from ram_protocol import (FRAME_HEADER, MAX_FRAME, OP_HELLO, OP_READ, OP_WRITE, OP_INJECT,
+                          OP_CLEAR_FAULTS, OP_SNAPSHOT, OP_RESTORE, OP_RESET,
+                          OP_DROP_SNAPSHOT, STATUS_OK, STATUS_ERROR, ADDRESS_DTYPE, DATA_DTYPE, COUNT, GEOMETRY,
+                          frame, decode_write, decode_faults)
+
+class Session:
+    """
+    Сессия клиента: общая модель сервера или (в изолированном режиме) собственная
+    копия, созданная из снимка базовой модели, и именованные снимки состояния
+    """
+
+    def __init__(self, ram: RAMModel, fault_model: FaultModel, max_snapshots: int,
+                 shared: bool = False):
+        self.ram = ram
+        self.fault_model = fault_model
+        self.max_snapshots = max_snapshots
+        self.shared = shared
+        self.snapshots: Dict[int, tuple] = {}
+        self.next_snapshot = 0
+        # Общую модель сессия не сбрасывает, и копия памяти при подключении не нужна
+        self.initial = None if shared else fault_model.snapshot()
+
+    def handle(self, code: int, payload: bytes) -> bytes:
+        if code == OP_HELLO:
+            return GEOMETRY.pack(self.ram.address_bits, self.ram.data_bits)
+        if code == OP_READ:
+            addresses = np.frombuffer(payload, ADDRESS_DTYPE)
+            # Адрес вне памяти нельзя отличить от хранимого нуля, поэтому пакет отклоняется
+            invalid = np.nonzero(~self.ram._validate_addresses(addresses.astype(np.int64)))[0]
+            if len(invalid):
+                raise ValueError(f"Адрес {addresses[invalid[0]]} вне памяти "
+                                 f"({self.ram.get_memory_size()} слов)")
+            return self.fault_model.simulate_read_batch(addresses).astype(DATA_DTYPE).tobytes()
+        if code == OP_WRITE:
+            addresses, data = decode_write(payload)
+            valid = self.fault_model.simulate_write_batch(addresses, data)
+            return COUNT.pack(int(np.count_nonzero(valid)))
+        if code == OP_INJECT:
+            applied = sum(spec.apply(self.fault_model) for spec in decode_faults(payload))
+            return COUNT.pack(applied)
+        if code == OP_CLEAR_FAULTS:
+            self.fault_model.clear_all_faults()
+            return b''
+        if code == OP_SNAPSHOT:
+            if len(self.snapshots) >= self.max_snapshots:
+                raise ValueError(f"Превышен лимит снимков сессии ({self.max_snapshots})")
+            snapshot_id = self.next_snapshot
+            self.next_snapshot += 1
+            self.snapshots[snapshot_id] = self.fault_model.snapshot()
+            return COUNT.pack(snapshot_id)
+        if code in (OP_RESTORE, OP_DROP_SNAPSHOT):
+            (snapshot_id,) = COUNT.unpack(payload)
+            if snapshot_id not in self.snapshots:
+                raise ValueError(f"Нет снимка {snapshot_id}")
+            # Снимок остается после восстановления, освобождается только явно
+            if code == OP_RESTORE:
+                self.fault_model.restore(self.snapshots[snapshot_id])
+            else:
+                del self.snapshots[snapshot_id]
+            return b''
+        if code == OP_RESET:
+            # Общую модель сброс вернул бы к состоянию на момент подключения клиента,
+            # затерев работу остальных клиентов
+            if self.shared:
+                raise ValueError("Сброс недоступен в режиме общей модели")
+            self.fault_model.restore(self.initial)
+            self.snapshots.clear()
+            return b''
+        raise ValueError(f"Неизвестная операция {code}")
+
+class RAMServer:
+    """
+    Один долгоживущий двойник для многих клиентов. Запросы одного соединения
+    обрабатываются по порядку (конвейер), ответ отправляется с drain(),
+    поэтому медленный клиент притормаживает только собственное соединение.
+    По умолчанию все клиенты работают с общей моделью и видят записи друг друга;
+    при isolated каждая сессия получает собственную копию из снимка базовой модели.
+    """
+
+    def __init__(self, address_bits: int = 8, data_bits: int = 8, isolated: bool = False,
+                 max_frame: int = MAX_FRAME, max_snapshots: int = 16):
+        self.ram = RAMModel(address_bits, data_bits)
+        self.fault_model = FaultModel(self.ram)
+        self.isolated = isolated
+        self.max_frame = max_frame
+        self.max_snapshots = max_snapshots
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.unix_path: Optional[str] = None
+        self.sessions = 0
+
+    def _new_session(self) -> Session:
+        if not self.isolated:
+            return Session(self.ram, self.fault_model, self.max_snapshots, shared=True)
+        ram = RAMModel(self.ram.address_bits, self.ram.data_bits)
+        fault_model = FaultModel(ram)
+        fault_model.restore(self.fault_model.snapshot())
+        return Session(ram, fault_model, self.max_snapshots)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = self._new_session()
+        self.sessions += 1
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                length, request_id, code = FRAME_HEADER.unpack(header)
+                if length > self.max_frame:
+                    writer.write(frame(request_id, STATUS_ERROR,
+                                       f"Кадр больше {self.max_frame} байт".encode()))
+                    await writer.drain()
+                    break
+                payload = await reader.readexactly(length)
+                try:
+                    response = frame(request_id, STATUS_OK, session.handle(code, payload))
+                except Exception as e:
+                    response = frame(request_id, STATUS_ERROR, str(e).encode())
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def start_unix(self, path: str):
+        # Сокет, оставшийся после аварийного завершения, мешает bind()
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        self.server = await asyncio.start_unix_server(self._handle_client, path=path)
+        self.unix_path = path
+        return self.server
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0):
+        if not is_loopback(host):
+            raise ValueError(f"Сервер принимает подключения только на loopback-адресе, не {host}")
+        self.server = await asyncio.start_server(self._handle_client, host, port)
+        return self.server
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        if self.unix_path is not None:
+            if os.path.exists(self.unix_path):
+                os.unlink(self.unix_path)
+            self.unix_path = None
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер цифрового двойника ОЗУ")
+    parser.add_argument('--unix', help="путь Unix-сокета")
+    parser.add_argument('--host', default='127.0.0.1', help="loopback-адрес TCP")
+    parser.add_argument('--port', type=int, default=9876)
+    parser.add_argument('--address-bits', type=int, default=8)
+    parser.add_argument('--data-bits', type=int, default=8)
+    parser.add_argument('--isolated', action='store_true',
+                        help="каждый клиент работает с собственной копией модели")
+    args = parser.parse_args()
+    if not args.unix and not is_loopback(args.host):
+        parser.error(f"--host должен быть loopback-адресом, получено {args.host}")
+
+    async def run():
+        server = RAMServer(args.address_bits, args.data_bits, isolated=args.isolated)
+        if args.unix:
+            await server.start_unix(args.unix)
+            print(f"Сервер ОЗУ: {args.unix}")
+        else:
+            srv = await server.start_tcp(args.host, args.port)
+            print(f"Сервер ОЗУ: {srv.sockets[0].getsockname()}")
+        try:
+            await server.serve_forever()
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
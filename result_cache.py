@@ -0,0 +1,229 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+from testing_algorithms import TestResult
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "kidsvt", "results.sqlite")
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Версия схемы таблицы; при несовпадении кэш пересоздается
+SCHEMA_VERSION = 2
+
+@lru_cache(maxsize=None)
+def _project_imports(path: str) -> Tuple[str, ...]:
+    """
+    Файлы модулей проекта, импортируемых модулем path
+    """
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    files = []
+    for name in names:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            continue
+        origin = spec.origin if spec else None
+        if origin and os.path.abspath(origin).startswith(PROJECT_DIR + os.sep):
+            files.append(os.path.abspath(origin))
+    return tuple(files)
+
+def _module_closure(paths: List[str]) -> List[str]:
+    seen, stack = set(), list(paths)
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        stack.extend(_project_imports(path))
+    return sorted(seen)
+
+@lru_cache(maxsize=None)
+def code_fingerprint(cls) -> str:
+    """
+    Хэш исходного кода класса и его предков (кроме object), а также
+    определяющих их модулей и всех импортируемых ими модулей проекта
+    """
+    h = hashlib.sha256()
+    paths = []
+    for klass in cls.__mro__:
+        if klass is object:
+            continue
+        h.update(f"{klass.__module__}.{klass.__qualname__}".encode())
+        try:
+            h.update(inspect.getsource(klass).encode())
+        except (OSError, TypeError):
+            pass
+        path = getattr(sys.modules.get(klass.__module__), '__file__', None)
+        if path and os.path.isfile(path) and os.path.abspath(path).startswith(PROJECT_DIR + os.sep):
+            paths.append(os.path.abspath(path))
+    for path in _module_closure(paths):
+        h.update(os.path.relpath(path, PROJECT_DIR).encode())
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def algorithm_name(cls) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+def canonical_faults(fault_model) -> list:
+    """
+    Неисправности упорядочиваются по адресу; внутри адреса сохраняется порядок
+    внедрения, так как от него зависит результат наложения
+    """
+    faults = []
+    for (addr, bit), info in fault_model.active_faults.items():
+        params = sorted((str(k), v) for k, v in info['params'].items())
+        faults.append([addr, bit, info['type'].name, params])
+    return sorted(faults, key=lambda fault: fault[0])
+
+def cache_key(algorithm_cls, ram, fault_model) -> str:
+    """
+    Ключ кэша: код алгоритма и моделей + геометрия + каноничный набор неисправностей.
+    Начальное содержимое памяти в ключ не входит: алгоритмы сами инициализируют ячейки.
+    """
+    code_hash = hashlib.sha256("".join((
+        code_fingerprint(algorithm_cls),
+        code_fingerprint(type(ram)),
+        code_fingerprint(type(fault_model)),
+    )).encode()).hexdigest()
+    payload = json.dumps({
+        'code': code_hash,
+        'address_bits': ram.address_bits,
+        'data_bits': ram.data_bits,
+        'faults': canonical_faults(fault_model),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _pack(obj) -> bytes:
+    return zlib.compress(json.dumps(obj).encode())
+
+def _unpack(blob: bytes):
+    return json.loads(zlib.decompress(blob).decode())
+
+class ResultCache:
+    """
+    Персистентный кэш результатов тестирования (SQLite, LRU-вытеснение по объему)
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS results")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                algorithm TEXT NOT NULL,
+                algorithm_hash TEXT NOT NULL,
+                summary BLOB NOT NULL,
+                trace BLOB,
+                state BLOB,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON results(last_access)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, with_trace: bool = True) -> Optional[Tuple[dict, Optional[list], Optional[bytes]]]:
+        row = self.conn.execute(
+            "SELECT summary, trace, state FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (with_trace and row[1] is None):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        trace = _unpack(row[1]) if with_trace else None
+        return _unpack(row[0]), trace, row[2]
+
+    def put(self, key: str, algorithm: str, algorithm_hash: str, summary: dict,
+            trace: Optional[list] = None, state: Optional[bytes] = None):
+        summary_blob = _pack(summary)
+        trace_blob = _pack(trace) if trace is not None else None
+        size = len(summary_blob) + len(trace_blob or b"") + len(state or b"")
+        # Записи того же алгоритма со старым кодом больше никогда не совпадут;
+        # записи с другими моделями ОЗУ/неисправностей остаются
+        self.conn.execute("DELETE FROM results WHERE algorithm = ? AND algorithm_hash != ?",
+                          (algorithm, algorithm_hash))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, algorithm, algorithm_hash, summary_blob, trace_blob, state, size, time.time()))
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute(
+                "SELECT key, size FROM results ORDER BY last_access").fetchall():
+            self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def run(self, algorithm_cls, ram, fault_model, with_trace: bool = True) -> TestResult:
+        """
+        Запуск алгоритма через кэш: при попадании результат и конечное
+        состояние памяти восстанавливаются без симуляции
+        """
+        key = cache_key(algorithm_cls, ram, fault_model)
+        cached = self.get(key, with_trace)
+        if cached is not None:
+            summary, trace, state = cached
+            result = TestResult()
+            result.passed = summary['passed']
+            result.errors = summary['errors']
+            result.detected_faults = summary['detected_faults']
+            result.coverage = summary['coverage']
+            result.test_steps = trace or []
+            if state is not None:
+                bits = np.unpackbits(np.frombuffer(state, dtype=np.uint8))
+                ram.memory[:] = bits[:ram.memory.size].reshape(ram.memory.shape)
+            return result
+
+        result = algorithm_cls(ram, fault_model).run()
+        summary = {
+            'passed': result.passed,
+            'errors': result.errors,
+            'detected_faults': result.detected_faults,
+            'coverage': result.coverage,
+        }
+        state = np.packbits(ram.memory).tobytes()
+        self.put(key, algorithm_name(algorithm_cls), code_fingerprint(algorithm_cls), summary,
+                 result.test_steps if with_trace else None, state)
+        return result
+
+    def stats(self) -> dict:
+        count, total = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {'entries': count, 'bytes': total, 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        self.conn.execute("DELETE FROM results")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,182 @@
+import itertools
+import os
+import tempfile
+from typing import Dict, List, Union
+import numpy as np
+from ram_model import RAMModel
+from fault_models import FaultModel, FaultType, FaultSpec
+from op_stream import record, OpLog, failing_addresses
+
+# Число единичных битов для каждого значения байта
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+def popcount(packed: np.ndarray) -> int:
+    return int(POPCOUNT[packed].sum())
+
+class DetectionMatrix:
+    """
+    Битовая матрица обнаружения: строка - алгоритм, бит - неисправность
+    """
+
+    def __init__(self, names: List[str], costs: List[int], fault_types: List[FaultType],
+                 detected: np.ndarray):
+        self.names = list(names)
+        self.costs = np.asarray(costs, dtype=np.int64)
+        self.fault_count = len(fault_types)
+        self.bits = np.packbits(np.asarray(detected, dtype=bool), axis=1)
+        self.type_masks: Dict[FaultType, np.ndarray] = {}
+        type_array = np.array([ft.name for ft in fault_types])
+        for ft in FaultType:
+            mask = type_array == ft.name
+            if mask.any():
+                self.type_masks[ft] = np.packbits(mask)
+
+    def type_totals(self) -> Dict[FaultType, int]:
+        return {ft: popcount(mask) for ft, mask in self.type_masks.items()}
+
+    def covered(self, packed: np.ndarray) -> Dict[FaultType, int]:
+        return {ft: popcount(packed & mask) for ft, mask in self.type_masks.items()}
+
+    def union(self, indices) -> np.ndarray:
+        packed = np.zeros(self.bits.shape[1], dtype=np.uint8)
+        for i in indices:
+            packed |= self.bits[i]
+        return packed
+
+def build_detection_matrix(algorithms: list, faults: List[FaultSpec],
+                           address_bits: int = 8, data_bits: int = 8) -> DetectionMatrix:
+    """
+    Поток операций каждого алгоритма записывается один раз без неисправностей,
+    затем воспроизводится с неисправностями; стоимость - число операций.
+    Неисправности из WORD_LOCAL_FAULTS на разных адресах не влияют друг на друга,
+    поэтому за один прогон внедряется сразу по одной такой неисправности на каждый адрес;
+    остальные воспроизводятся по одной.
+    """
+    ram = RAMModel(address_bits, data_bits)
+    fault_model = FaultModel(ram)
+    addresses = np.array([spec.address for spec in faults], dtype=np.int64)
+    # Номер прогона - порядковый номер неисправности среди неисправностей того же адреса
+    seen: Dict[int, int] = {}
+    rounds = np.full(len(faults), -1, dtype=np.int64)
+    for j, spec in enumerate(faults):
+        if spec.word_local:
+            rounds[j] = seen.get(spec.address, 0)
+            seen[spec.address] = rounds[j] + 1
+    isolated = [j for j, spec in enumerate(faults) if not spec.word_local]
+
+    detected = np.zeros((len(algorithms), len(faults)), dtype=bool)
+    costs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, algorithm_cls in enumerate(algorithms):
+            path = os.path.join(tmp, f"{i}.oplog")
+            ram.clear()
+            fault_model.clear_all_faults()
+            record(algorithm_cls(ram, fault_model), path)
+            op_log = OpLog(path)
+            costs.append(len(op_log))
+            for r in range(max(seen.values(), default=0)):
+                members = np.nonzero(rounds == r)[0]
+                ram.clear()
+                fault_model.clear_all_faults()
+                for j in members.tolist():
+                    faults[j].apply(fault_model)
+                failed = failing_addresses(op_log, fault_model)
+                detected[i, members] = np.isin(addresses[members], failed)
+            # Ошибка такой неисправности может проявиться на чужом адресе
+            for j in isolated:
+                ram.clear()
+                fault_model.clear_all_faults()
+                faults[j].apply(fault_model)
+                detected[i, j] = len(failing_addresses(op_log, fault_model)) > 0
+            del op_log
+    names = [cls.__name__ for cls in algorithms]
+    return DetectionMatrix(names, costs, [spec.fault_type for spec in faults], detected)
+
+class SuiteSelection:
+    def __init__(self, names: List[str], cost: int, coverage: Dict[FaultType, float],
+                 feasible: bool):
+        self.names = names
+        self.cost = cost
+        self.coverage = coverage
+        self.feasible = feasible
+
+    def summary(self) -> str:
+        lines = [f"Набор: {', '.join(self.names) or '-'} (операций: {self.cost}, "
+                 f"{'цель достигнута' if self.feasible else 'цель недостижима'})"]
+        for ft, value in self.coverage.items():
+            lines.append(f"  {ft.value}: {value:.3f}")
+        return "\n".join(lines)
+
+class SuiteOptimizer:
+    """
+    Взвешенное покрытие множества: минимальный по числу операций набор алгоритмов,
+    достигающий целевого покрытия по каждому FaultType
+    """
+
+    def __init__(self, matrix: DetectionMatrix, exact_limit: int = 12):
+        self.matrix = matrix
+        self.exact_limit = exact_limit
+        self.totals = matrix.type_totals()
+
+    def _required(self, targets: Union[float, Dict[FaultType, float]]) -> Dict[FaultType, int]:
+        required = {}
+        for ft, total in self.totals.items():
+            target = targets if isinstance(targets, (int, float)) else targets.get(ft, 0.0)
+            required[ft] = int(np.ceil(target * total - 1e-9))
+        return required
+
+    def _satisfied(self, covered: Dict[FaultType, int], required: Dict[FaultType, int]) -> bool:
+        return all(covered[ft] >= need for ft, need in required.items())
+
+    def _selection(self, indices, required) -> SuiteSelection:
+        indices = sorted(indices)
+        covered = self.matrix.covered(self.matrix.union(indices))
+        coverage = {ft: covered[ft] / total for ft, total in self.totals.items()}
+        return SuiteSelection([self.matrix.names[i] for i in indices],
+                              int(self.matrix.costs[indices].sum()) if indices else 0,
+                              coverage, self._satisfied(covered, required))
+
+    def optimize(self, targets: Union[float, Dict[FaultType, float]] = 1.0) -> SuiteSelection:
+        required = self._required(targets)
+        # Цель не может превышать то, что дают все алгоритмы вместе
+        reachable = self.matrix.covered(self.matrix.union(range(len(self.matrix.names))))
+        capped = {ft: min(need, reachable[ft]) for ft, need in required.items()}
+        if len(self.matrix.names) <= self.exact_limit:
+            indices = self._exact(capped)
+        else:
+            indices = self._greedy(capped)
+        return self._selection(indices, required)
+
+    def _exact(self, required: Dict[FaultType, int]) -> List[int]:
+        n = len(self.matrix.names)
+        subsets = []
+        for size in range(n + 1):
+            subsets.extend(itertools.combinations(range(n), size))
+        subsets.sort(key=lambda s: (int(self.matrix.costs[list(s)].sum()) if s else 0, len(s)))
+        for subset in subsets:
+            if self._satisfied(self.matrix.covered(self.matrix.union(subset)), required):
+                return list(subset)
+        return list(range(n))
+
+    def _greedy(self, required: Dict[FaultType, int]) -> List[int]:
+        chosen: List[int] = []
+        packed = np.zeros(self.matrix.bits.shape[1], dtype=np.uint8)
+        covered = self.matrix.covered(packed)
+        while not self._satisfied(covered, required):
+            best, best_ratio = None, 0.0
+            for i in range(len(self.matrix.names)):
+                if i in chosen:
+                    continue
+                gain_cov = self.matrix.covered(packed | self.matrix.bits[i])
+                # Учитывается только прирост, сокращающий недостачу до цели
+                gain = sum(min(gain_cov[ft], need) - min(covered[ft], need)
+                           for ft, need in required.items())
+                ratio = gain / max(1, int(self.matrix.costs[i]))
+                if ratio > best_ratio:
+                    best, best_ratio = i, ratio
+            if best is None:
+                break
+            chosen.append(best)
+            packed |= self.matrix.bits[best]
+            covered = self.matrix.covered(packed)
+        return chosen
@@ -1,5 +1,7 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import numpy as np
+from ram_model import MAX_WORD_BITS
+from data_backgrounds import DataBackground, checkerboard, column_stripe, standard_backgrounds
 
 class TestResult:
     def __init__(self):
@@ -22,114 +24,245 @@ class TestResult:
         if not passed:
             self.passed = False
             self.errors.append(f"Адрес {address}: ожидалось {expected}, получено {actual}")
+    
+    def add_batch(self, step: str, addresses: np.ndarray, expected: np.ndarray,
+                  actual: np.ndarray):
+        # В пакетном режиме в шаги попадают только несовпавшие чтения
+        for i in np.nonzero(actual != expected)[0].tolist():
+            self.add_step(step, int(addresses[i]), "READ", int(expected[i]), int(actual[i]), False)
 
 class TestingAlgorithm:
-    def __init__(self, ram_model, fault_model):
+    def __init__(self, ram_model, fault_model, background: Optional[DataBackground] = None):
         self.ram = ram_model
         self.fault_model = fault_model
+        self.background = background
         self.result = TestResult()
+        # Необязательный наблюдатель операций: (op, address, data, step);
+        # в пакетном режиме address и data - массивы
+        self.op_listener = None
     
     def run(self) -> TestResult:
         self.result = TestResult()
         return self.result
     
+    def run_batched(self) -> TestResult:
+        """
+        Тот же тест через пакетные пути модели: заполнение и сравнение массивами
+        """
+        return self.run()
+    
+    def _batchable(self) -> bool:
+        """
+        Пакетные пути хранят слова в uint64 и считают слова независимыми;
+        более широкие слова и неисправности вне WORD_LOCAL_FAULTS
+        проходят тест последовательно
+        """
+        return self.ram.data_bits <= MAX_WORD_BITS and self.fault_model.is_word_local()
+    
+    def run_backgrounds(self, backgrounds: Optional[List[DataBackground]] = None) -> Dict[str, TestResult]:
+        """
+        Пакетный прогон теста по одному разу на каждый фон данных
+        (при словах шире MAX_WORD_BITS - последовательный)
+        """
+        if backgrounds is None:
+            backgrounds = standard_backgrounds(self.ram.data_bits)
+        saved = self.background
+        results = {}
+        try:
+            for background in backgrounds:
+                self.background = background
+                results[background.name] = self.run_batched()
+        finally:
+            self.background = saved
+        return results
+    
+    def default_background(self) -> Optional[DataBackground]:
+        return None
+    
+    def _value(self, address: int, logical: int) -> int:
+        """
+        Логический 0 - значение фона, логическая 1 - его инверсия.
+        Без фона значение записывается как есть.
+        """
+        background = self.background or self.default_background()
+        if background is None:
+            return logical
+        return background.value(address) ^ (background.mask if logical else 0)
+    
+    def _values(self, addresses: np.ndarray, logical: int) -> np.ndarray:
+        background = self.background or self.default_background()
+        if background is None:
+            return np.full(len(addresses), logical, dtype=np.uint64)
+        return background.values(addresses) ^ np.uint64(background.mask if logical else 0)
+    
     def _read_and_verify(self, address: int, expected: int, step: str) -> bool:
         actual = self.fault_model.simulate_read(address)
         passed = (actual == expected)
         self.result.add_step(step, address, "READ", expected, actual, passed)
+        if self.op_listener is not None:
+            self.op_listener("READ", address, expected, step)
         return passed
     
     def _write(self, address: int, data: int, step: str):
         self.fault_model.simulate_write(address, data)
         self.result.add_step(step, address, "WRITE", data, data, True)
+        if self.op_listener is not None:
+            self.op_listener("WRITE", address, data, step)
+    
+    def _compare(self, addresses: np.ndarray, expected: np.ndarray, step: str):
+        actual = self.fault_model.simulate_read_batch(addresses)
+        self.result.add_batch(step, addresses, expected, actual)
+        if self.op_listener is not None:
+            self.op_listener("READ", addresses, expected, step)
+    
+    def _fill(self, addresses: np.ndarray, data: np.ndarray, step: str):
+        self.fault_model.simulate_write_batch(addresses, data)
+        if self.op_listener is not None:
+            self.op_listener("WRITE", addresses, data, step)
 
-class MarchC(TestingAlgorithm):
+class MarchTest(TestingAlgorithm):
+    """
+    March-тест, заданный списком элементов (порядок адресов, имя шага, операции).
+    Операции: "r0"/"r1" - чтение с проверкой, "w0"/"w1" - запись логического значения.
+    Если имя шага не задано, шагом служит сама операция ("R0", "W1").
+    """
+    ELEMENTS: List[Tuple[str, Optional[str], List[str]]] = []
+    
+    def _addresses(self, order: str) -> range:
+        mem_size = self.ram.get_memory_size()
+        return range(mem_size) if order == "up" else range(mem_size - 1, -1, -1)
+    
     def run(self) -> TestResult:
         self.result = TestResult()
-        mem_size = self.ram.get_memory_size()
-        
-        # 1. Write 0
-        for addr in range(mem_size): self._write(addr, 0, "Init 0")
-        # 2. Read 0, Write 1 (Up)
-        for addr in range(mem_size):
-            self._read_and_verify(addr, 0, "R0 W1 Up")
-            self._write(addr, 1, "R0 W1 Up")
-        # 3. Read 1, Write 0 (Up)
-        for addr in range(mem_size):
-            self._read_and_verify(addr, 1, "R1 W0 Up")
-            self._write(addr, 0, "R1 W0 Up")
-        # 4. Read 0, Write 1 (Down)
-        for addr in range(mem_size - 1, -1, -1):
-            self._read_and_verify(addr, 0, "R0 W1 Down")
-            self._write(addr, 1, "R0 W1 Down")
-        # 5. Read 1, Write 0 (Down)
-        for addr in range(mem_size - 1, -1, -1):
-            self._read_and_verify(addr, 1, "R1 W0 Down")
-            self._write(addr, 0, "R1 W0 Down")
-        # 6. Read 0
-        for addr in range(mem_size): self._read_and_verify(addr, 0, "Final R0")
-        
+        for order, step, ops in self.ELEMENTS:
+            for addr in self._addresses(order):
+                for op in ops:
+                    value = self._value(addr, int(op[1]))
+                    name = step or op.upper()
+                    if op[0] == "r": self._read_and_verify(addr, value, name)
+                    else: self._write(addr, value, name)
         return self.result
-
-class MarchB(TestingAlgorithm):
-    def run(self) -> TestResult:
+    
+    def run_batched(self) -> TestResult:
+        if not self._batchable():
+            return self.run()
+        # Слова независимы (_batchable), поэтому элемент выполняется операция за операцией
+        # сразу по всем адресам, с сохранением порядка операций в каждой ячейке
         self.result = TestResult()
-        mem_size = self.ram.get_memory_size()
-        for addr in range(mem_size): self._write(addr, 0, "Init 0")
-        for addr in range(mem_size):
-            self._read_and_verify(addr, 0, "R0")
-            self._write(addr, 1, "W1")
-        for addr in range(mem_size):
-            self._read_and_verify(addr, 1, "R1")
-            self._write(addr, 0, "W0")
-        for addr in range(mem_size - 1, -1, -1):
-            self._read_and_verify(addr, 0, "R0")
-            self._write(addr, 1, "W1")
-        for addr in range(mem_size - 1, -1, -1):
-            self._read_and_verify(addr, 1, "R1")
-            self._write(addr, 0, "W0")
+        for order, step, ops in self.ELEMENTS:
+            addresses = np.array(self._addresses(order), dtype=np.int64)
+            for op in ops:
+                values = self._values(addresses, int(op[1]))
+                name = step or op.upper()
+                if op[0] == "r": self._compare(addresses, values, name)
+                else: self._fill(addresses, values, name)
         return self.result
 
+class MarchC(MarchTest):
+    ELEMENTS = [
+        ("up", "Init 0", ["w0"]),
+        ("up", "R0 W1 Up", ["r0", "w1"]),
+        ("up", "R1 W0 Up", ["r1", "w0"]),
+        ("down", "R0 W1 Down", ["r0", "w1"]),
+        ("down", "R1 W0 Down", ["r1", "w0"]),
+        ("up", "Final R0", ["r0"]),
+    ]
+
+class MarchB(MarchTest):
+    ELEMENTS = [
+        ("up", "Init 0", ["w0"]),
+        ("up", None, ["r0", "w1"]),
+        ("up", None, ["r1", "w0"]),
+        ("down", None, ["r0", "w1"]),
+        ("down", None, ["r1", "w0"]),
+    ]
+
 class Checkerboard(TestingAlgorithm):
+    def default_background(self) -> Optional[DataBackground]:
+        return checkerboard(self.ram.data_bits)
+    
     def run(self) -> TestResult:
         self.result = TestResult()
         mem_size = self.ram.get_memory_size()
         for addr in range(mem_size):
-            pattern = 0xAA if addr % 2 == 0 else 0x55
-            self._write(addr, pattern, "Write Pattern")
+            self._write(addr, self._value(addr, 0), "Write Pattern")
         for addr in range(mem_size):
-            expected = 0xAA if addr % 2 == 0 else 0x55
-            self._read_and_verify(addr, expected, "Read Pattern")
+            self._read_and_verify(addr, self._value(addr, 0), "Read Pattern")
+        return self.result
+    
+    def run_batched(self) -> TestResult:
+        if not self._batchable():
+            return self.run()
+        self.result = TestResult()
+        addresses = np.arange(self.ram.get_memory_size(), dtype=np.int64)
+        values = self._values(addresses, 0)
+        self._fill(addresses, values, "Write Pattern")
+        self._compare(addresses, values, "Read Pattern")
         return self.result
 
 class WalkingOne(TestingAlgorithm):
     def run(self) -> TestResult:
         self.result = TestResult()
         mem_size = self.ram.get_memory_size()
-        for addr in range(mem_size): self._write(addr, 0, "Clear")
+        for addr in range(mem_size): self._write(addr, self._value(addr, 0), "Clear")
         
         # Упрощенная версия для скорости (проверяет только первые 16 ячеек, если память большая)
         limit = min(mem_size, 32) 
         for test_addr in range(limit):
-            self._write(test_addr, 1, f"Set bit {test_addr}")
+            self._write(test_addr, self._value(test_addr, 1), f"Set bit {test_addr}")
             for addr in range(limit):
-                expected = 1 if addr == test_addr else 0
+                expected = self._value(addr, 1 if addr == test_addr else 0)
                 self._read_and_verify(addr, expected, f"Check {addr}")
-            self._write(test_addr, 0, "Clear bit")
+            self._write(test_addr, self._value(test_addr, 0), "Clear bit")
+        return self.result
+    
+    def run_batched(self) -> TestResult:
+        if not self._batchable():
+            return self.run()
+        self.result = TestResult()
+        addresses = np.arange(self.ram.get_memory_size(), dtype=np.int64)
+        self._fill(addresses, self._values(addresses, 0), "Clear")
+        
+        window = addresses[:min(len(addresses), 32)]
+        base = self._values(window, 0)
+        for test_addr in window.tolist():
+            self._write(test_addr, self._value(test_addr, 1), f"Set bit {test_addr}")
+            expected = base.copy()
+            expected[test_addr] = self._value(test_addr, 1)
+            self._compare(window, expected, f"Check {test_addr}")
+            self._write(test_addr, int(base[test_addr]), "Clear bit")
         return self.result
 
 class GallopingPattern(TestingAlgorithm):
+    def default_background(self) -> Optional[DataBackground]:
+        return column_stripe(self.ram.data_bits)
+    
     def run(self) -> TestResult:
         self.result = TestResult()
         mem_size = self.ram.get_memory_size()
-        base = 0x55
-        for addr in range(mem_size): self._write(addr, base, "Init")
+        for addr in range(mem_size): self._write(addr, self._value(addr, 0), "Init")
         
         limit = min(mem_size, 32) # Ограничиваем для производительности UI
         for test_addr in range(limit):
-            self._write(test_addr, 0xAA, "Flip")
+            self._write(test_addr, self._value(test_addr, 1), "Flip")
             for addr in range(limit):
                 if addr != test_addr:
-                    self._read_and_verify(addr, base, "Verify Others")
-            self._write(test_addr, base, "Restore")
+                    self._read_and_verify(addr, self._value(addr, 0), "Verify Others")
+            self._write(test_addr, self._value(test_addr, 0), "Restore")
+        return self.result
+    
+    def run_batched(self) -> TestResult:
+        if not self._batchable():
+            return self.run()
+        self.result = TestResult()
+        addresses = np.arange(self.ram.get_memory_size(), dtype=np.int64)
+        self._fill(addresses, self._values(addresses, 0), "Init")
+        
+        window = addresses[:min(len(addresses), 32)]
+        base = self._values(window, 0)
+        for test_addr in window.tolist():
+            self._write(test_addr, self._value(test_addr, 1), "Flip")
+            others = window != test_addr
+            self._compare(window[others], base[others], "Verify Others")
+            self._write(test_addr, int(base[test_addr]), "Restore")
         return self.result
\ No newline at end of file
@@ -1,7 +1,22 @@
+import asyncio
+import itertools
+import os
 import random
+import tempfile
+import threading
 import time
+import numpy as np
 from ram_model import RAMModel
-from fault_models import FaultModel, FaultType
+from fault_models import FaultModel, FaultType, FaultSpec
+from testing_algorithms import MarchC, MarchB, Checkerboard, WalkingOne, GallopingPattern
+from op_stream import OpLog, record, replay
+from ecc import SECDEDCode, STATUS_CORRECTED, STATUS_DETECTED
+from suite_optimizer import build_detection_matrix
+from result_cache import ResultCache
+from ram_server import RAMServer
+from ram_client import RAMClient, RAMServerError
+
+ALGORITHMS = (MarchC, MarchB, Checkerboard, WalkingOne, GallopingPattern)
 
 class VerificationResult:
     def __init__(self):
@@ -65,6 +80,73 @@ class Verifier:
             result.add_error(str(e))
         return result
 
+    @staticmethod
+    def verify_ecc_code(data_bits: int = 8, words: int = 8, seed=None) -> VerificationResult:
+        """
+        SECDED: каждая одиночная ошибка кодового слова исправляется,
+        каждая двойная - обнаруживается
+        """
+        result = VerificationResult()
+        try:
+            code = SECDEDCode(data_bits)
+            rng = np.random.default_rng(seed)
+            data = rng.integers(0, 2, size=(words, data_bits), dtype=np.uint8)
+            codeword = np.concatenate([data, code.encode(data)], axis=1)
+            width = codeword.shape[1]
+
+            for i in range(width):
+                damaged = codeword.copy()
+                damaged[:, i] ^= 1
+                corrected, status = code.decode(damaged[:, :data_bits], damaged[:, data_bits:])
+                ok = (corrected == data).all() and (status == STATUS_CORRECTED).all()
+                result.add_test_result(bool(ok))
+                if not ok:
+                    result.add_error(f"Одиночная ошибка в бите {i} не исправлена")
+
+            for i, j in itertools.combinations(range(width), 2):
+                damaged = codeword.copy()
+                damaged[:, [i, j]] ^= 1
+                _, status = code.decode(damaged[:, :data_bits], damaged[:, data_bits:])
+                ok = (status == STATUS_DETECTED).all()
+                result.add_test_result(bool(ok))
+                if not ok:
+                    result.add_error(f"Двойная ошибка в битах {i}, {j} не обнаружена")
+        except Exception as e:
+            result.add_error(str(e))
+        return result
+
+    @staticmethod
+    def verify_result_cache(address_bits: int = 4, data_bits: int = 8) -> VerificationResult:
+        """
+        Попадание в кэш возвращает те же ошибки и то же конечное состояние памяти,
+        что и прогон алгоритма
+        """
+        result = VerificationResult()
+        cache = ResultCache(":memory:")
+        try:
+            ram = RAMModel(address_bits, data_bits)
+            fault_model = FaultModel(ram)
+            fault_model.apply_fault(1, FaultType.STUCK_AT_1, 0)
+            fault_model.apply_fault(2, FaultType.COUPLING, 1, coupling_bit=2)
+            computed = cache.run(MarchC, ram, fault_model)
+            memory = ram.get_memory_state()
+
+            ram.memory.fill(0)
+            cached = cache.run(MarchC, ram, fault_model)
+            result.add_test_result(cache.hits == 1)
+            if cache.hits != 1:
+                result.add_error("Повторный прогон не попал в кэш")
+            same = (cached.passed == computed.passed and cached.errors == computed.errors
+                    and (ram.memory == memory).all())
+            result.add_test_result(bool(same))
+            if not same:
+                result.add_error("Результат из кэша отличается от прогона")
+        except Exception as e:
+            result.add_error(str(e))
+        finally:
+            cache.close()
+        return result
+
 class DynamicVerifier:
     @staticmethod
     def run_stress_test(ram: RAMModel, iterations: int = 1000) -> VerificationResult:
@@ -119,4 +201,174 @@ class DynamicVerifier:
             result.add_test_result(passed)
         except Exception as e:
             result.add_error(str(e))
-        return result
\ No newline at end of file
+        return result
+
+    @staticmethod
+    def _random_faults(rng: random.Random, address_bits: int, data_bits: int) -> list:
+        specs = []
+        for _ in range(rng.randint(0, 4)):
+            fault_type = rng.choice(list(FaultType))
+            address = rng.randrange(2 ** address_bits)
+            bit = rng.randrange(data_bits)
+            params = {}
+            if fault_type == FaultType.COUPLING:
+                params['coupling_bit'] = rng.randrange(data_bits)
+            elif fault_type == FaultType.BRIDGING:
+                params['bridge_bit'] = rng.randrange(data_bits)
+            specs.append(FaultSpec(fault_type, address, bit, **params))
+        return specs
+
+    @staticmethod
+    def _faulty_twin(address_bits: int, data_bits: int, specs: list):
+        ram = RAMModel(address_bits, data_bits)
+        fault_model = FaultModel(ram)
+        for spec in specs:
+            spec.apply(fault_model)
+        return ram, fault_model
+
+    @staticmethod
+    def run_batched_equivalence(ram: RAMModel, trials: int = 20, seed=None,
+                                algorithms=ALGORITHMS) -> VerificationResult:
+        """
+        Пакетный прогон должен совпадать с последовательным на случайных наборах
+        неисправностей: вердикт, ошибки и конечное состояние памяти
+        """
+        result = VerificationResult()
+        start_time = time.time()
+        rng = random.Random(seed)
+        address_bits, data_bits = min(ram.address_bits, 6), ram.data_bits
+        try:
+            for _ in range(trials):
+                specs = DynamicVerifier._random_faults(rng, address_bits, data_bits)
+                for algorithm_cls in algorithms:
+                    ram_a, fm_a = DynamicVerifier._faulty_twin(address_bits, data_bits, specs)
+                    ram_b, fm_b = DynamicVerifier._faulty_twin(address_bits, data_bits, specs)
+                    sequential = algorithm_cls(ram_a, fm_a).run()
+                    batched = algorithm_cls(ram_b, fm_b).run_batched()
+                    same = (sequential.passed == batched.passed
+                            and sequential.errors == batched.errors
+                            and (ram_a.memory == ram_b.memory).all())
+                    result.add_test_result(same)
+                    if not same:
+                        result.add_error(f"{algorithm_cls.__name__}: пакетный прогон расходится, {specs}")
+        except Exception as e:
+            result.add_error(str(e))
+        result.execution_time = time.time() - start_time
+        return result
+
+    @staticmethod
+    def run_replay_equivalence(ram: RAMModel, trials: int = 20, seed=None,
+                               algorithms=ALGORITHMS) -> VerificationResult:
+        """
+        Воспроизведение исправного журнала операций на модели с неисправностями
+        должно давать те же ошибки и состояние памяти, что и прямой прогон
+        """
+        result = VerificationResult()
+        start_time = time.time()
+        rng = random.Random(seed)
+        address_bits, data_bits = min(ram.address_bits, 6), ram.data_bits
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                logs = {}
+                for algorithm_cls in algorithms:
+                    path = os.path.join(tmp, f"{algorithm_cls.__name__}.oplog")
+                    clean_ram, clean_fm = DynamicVerifier._faulty_twin(address_bits, data_bits, [])
+                    record(algorithm_cls(clean_ram, clean_fm), path)
+                    logs[algorithm_cls] = OpLog(path)
+                for _ in range(trials):
+                    specs = DynamicVerifier._random_faults(rng, address_bits, data_bits)
+                    for algorithm_cls, op_log in logs.items():
+                        ram_a, fm_a = DynamicVerifier._faulty_twin(address_bits, data_bits, specs)
+                        ram_b, fm_b = DynamicVerifier._faulty_twin(address_bits, data_bits, specs)
+                        direct = algorithm_cls(ram_a, fm_a).run()
+                        replayed = replay(op_log, fm_b)
+                        same = (direct.errors == replayed.errors
+                                and (ram_a.memory == ram_b.memory).all())
+                        result.add_test_result(same)
+                        if not same:
+                            result.add_error(f"{algorithm_cls.__name__}: воспроизведение расходится, {specs}")
+        except Exception as e:
+            result.add_error(str(e))
+        result.execution_time = time.time() - start_time
+        return result
+
+    @staticmethod
+    def run_detection_matrix_check(ram: RAMModel, faults: int = 12, seed=None,
+                                   algorithms=ALGORITHMS) -> VerificationResult:
+        """
+        Строка матрицы обнаружения должна совпадать с прямым прогоном run()
+        алгоритма на каждой неисправности по отдельности
+        """
+        result = VerificationResult()
+        start_time = time.time()
+        rng = random.Random(seed)
+        # Малая память, чтобы неисправности делили адреса и попадали в разные прогоны
+        address_bits, data_bits = min(ram.address_bits, 3), ram.data_bits
+        try:
+            specs = []
+            while len(specs) < faults:
+                specs.extend(DynamicVerifier._random_faults(rng, address_bits, data_bits))
+            specs = specs[:faults]
+            matrix = build_detection_matrix(list(algorithms), specs, address_bits, data_bits)
+            for i, algorithm_cls in enumerate(algorithms):
+                row = np.unpackbits(matrix.bits[i])[:len(specs)].astype(bool)
+                for j, spec in enumerate(specs):
+                    ram_a, fm_a = DynamicVerifier._faulty_twin(address_bits, data_bits, [spec])
+                    direct = not algorithm_cls(ram_a, fm_a).run().passed
+                    result.add_test_result(direct == row[j])
+                    if direct != row[j]:
+                        result.add_error(f"{algorithm_cls.__name__}: матрица расходится с run() на {spec}")
+        except Exception as e:
+            result.add_error(str(e))
+        result.execution_time = time.time() - start_time
+        return result
+
+    @staticmethod
+    def run_server_round_trip(address_bits: int = 6, data_bits: int = 16) -> VerificationResult:
+        """
+        Сервер двойника на Unix-сокете: запись/чтение, общая модель для двух клиентов,
+        внедрение неисправности, снимок и отказ на адресе вне памяти
+        """
+        result = VerificationResult()
+        start_time = time.time()
+        loop = asyncio.new_event_loop()
+        server = RAMServer(address_bits, data_bits)
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "ram.sock")
+                loop.run_until_complete(server.start_unix(path))
+                thread.start()
+                size = 2 ** address_bits
+                addresses = np.arange(size)
+                values = addresses * 3 + 1
+                with RAMClient(path) as first, RAMClient(path) as second:
+                    first.write(addresses, values)
+                    result.add_test_result(bool((second.read(addresses) == values).all()))
+
+                    snapshot_id = first.snapshot()
+                    # Бит 0 модели - старший бит слова
+                    first.inject([FaultSpec(FaultType.STUCK_AT_1, 0, 0)])
+                    result.add_test_result(int(second.read([0])[0]) == 1 | (1 << (data_bits - 1)))
+                    first.restore(snapshot_id)
+                    result.add_test_result(int(second.read([0])[0]) == 1)
+
+                    try:
+                        second.read([size])
+                        result.add_error("Чтение вне памяти не отклонено")
+                    except RAMServerError:
+                        result.add_test_result(True)
+                deadline = time.time() + 5
+                while server.sessions and time.time() < deadline:
+                    time.sleep(0.01)
+        except Exception as e:
+            result.add_error(str(e))
+        finally:
+            if thread.is_alive():
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+            server.close()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+        result.execution_time = time.time() - start_time
+        return result